@@ -1,12 +1,668 @@
 from mcp.server.fastmcp import FastMCP
-from pybaseball import playerid_lookup
-import pandas as pd
+from mcp.types import TextContent
+from rapidfuzz import fuzz, process
+import asyncio
+import requests
 import statsapi
-from datetime import datetime
+import concurrent.futures
+import diskcache
+import inspect
+import logging
+import orjson
+import os
+import time
+from cachetools import LRUCache, TTLCache, cached
+from cachetools.keys import hashkey
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import partial, wraps
+from importlib.metadata import version
+from requests.adapters import HTTPAdapter, Retry
+from tenacity import retry, retry_if_exception, stop_after_attempt, stop_after_delay, wait_exponential
+from threading import Lock, RLock
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+log = logging.getLogger(__name__)
 
 # Create an MCP server
 mcp = FastMCP("mlb_statsapi_mcp")
 
+# One pooled session for every statsapi request, so TCP/TLS connections to
+# statsapi.mlb.com are kept alive and reused across tool calls. The adapter only
+# retries failed connections, which never reached upstream; read timeouts are not
+# retried at any layer, and server errors are retried by _fetch_schedule_shard alone.
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(
+    pool_connections=16, pool_maxsize=32,
+    max_retries=Retry(total=2, connect=2, read=False, status=0, other=0, backoff_factor=0.2),
+))
+# statsapi passes no timeout, so without one a stalled socket would block the caller,
+# and everyone waiting on the same in-flight request, forever.
+_REQUEST_TIMEOUT = 10
+
+# statsapi.schedule always hydrates broadcasts and media content, which none of the
+# tools use; they roughly double the payload and are prone to upstream 500s. Only that
+# exact default is replaced: other statsapi calls on /schedule (e.g. game highlights)
+# hydrate what they need themselves.
+_STATSAPI_SCHEDULE_HYDRATE = "decisions,probablePitcher(note),linescore,broadcasts,game(content(media(epg)))"
+_SCHEDULE_HYDRATE = "decisions,probablePitcher,linescore"
+# Widest date range requested from the schedule endpoint at once; wider ranges are
+# split and fetched in parallel to stay clear of upstream timeouts.
+_SCHEDULE_SHARD_DAYS = 31
+
+def _trim_schedule_hydrate(url):
+    parts = urlsplit(url)
+    if not parts.path.endswith("/schedule"):
+        return url
+    query = parse_qs(parts.query, keep_blank_values=True)
+    hydrate = query.get("hydrate", [None])[0]
+    if hydrate == _STATSAPI_SCHEDULE_HYDRATE:
+        query["hydrate"] = [_SCHEDULE_HYDRATE]
+    elif hydrate == _STATSAPI_SCHEDULE_HYDRATE + ",seriesStatus":
+        query["hydrate"] = [_SCHEDULE_HYDRATE + ",seriesStatus"]
+    else:
+        return url
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+class _StatsapiRequests:
+    """
+    Stands in for the requests module inside statsapi, which calls requests.get
+    for every endpoint, and routes those calls through the pooled session.
+    statsapi.schedule requests have their hydrate parameter trimmed, requests
+    without a timeout get _REQUEST_TIMEOUT, and responses are decoded with orjson.
+    """
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault("timeout", _REQUEST_TIMEOUT)
+        response = _session.get(_trim_schedule_hydrate(url), **kwargs)
+        response.json = lambda **_: orjson.loads(response.content)
+        return response
+
+statsapi.requests = _StatsapiRequests()
+
+# In-memory caches, sized and expired according to how often the upstream data changes.
+_schedule_cache = TTLCache(maxsize=512, ttl=300)
+_live_schedule_cache = TTLCache(maxsize=128, ttl=30)
+_game_cache = TTLCache(maxsize=256, ttl=30)
+_team_cache = TTLCache(maxsize=64, ttl=86400)
+_player_cache = TTLCache(maxsize=2048, ttl=86400)
+_pace_cache = TTLCache(maxsize=32, ttl=86400)
+# Empty schedules, which statsapi can be very slow to return, and the last good
+# result for each schedule shard, served while the endpoint is degraded.
+_neg_cache = TTLCache(maxsize=256, ttl=60)
+_last_good_schedules = LRUCache(maxsize=512)
+_schedule_fallback_lock = Lock()
+_team_cache_lock = RLock()
+_player_cache_lock = RLock()
+_game_cache_lock = RLock()
+
+# On-disk cache for immutable results (past dates, completed seasons); survives server restarts.
+# Entries are pickled, so the directory lives under the user's own cache directory and is
+# kept private to them rather than in a shared, predictable location such as /tmp.
+_DISK_CACHE_DIR = os.environ.get("MCP_MLB_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "mcp_mlb_statsapi",
+)
+os.makedirs(_DISK_CACHE_DIR, mode=0o700, exist_ok=True)
+os.chmod(_DISK_CACHE_DIR, 0o700)
+_DISK = diskcache.Cache(_DISK_CACHE_DIR)
+# Disk entries are namespaced by the mlb-statsapi release that produced them,
+# so upgrading the wrapper (and possibly its payload shape) starts a fresh cache.
+_PAYLOAD_VERSION = version("mlb-statsapi")
+
+# Worker pool used to overlap independent upstream requests. Tasks submitted here
+# must never wait on other work submitted to the pool, or a full pool deadlocks.
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+
+def _in_thread(fn):
+    """
+    Exposes a blocking function as a coroutine that runs it in a worker thread, so
+    concurrent tool calls don't block the MCP event loop on network I/O.
+    """
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return wrapper
+
+def _tool(fn):
+    """
+    Registers the coroutine function fn as an MCP tool whose result is serialized
+    with orjson into a single text content block, and returns fn unchanged so other
+    tools can keep calling it for the plain result.
+    """
+    @wraps(fn)
+    async def encoded(*args, **kwargs):
+        result = await fn(*args, **kwargs)
+        if result is None:
+            return None
+        text = orjson.dumps(result, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return TextContent(type="text", text=text.decode())
+    encoded.__signature__ = inspect.signature(fn).replace(return_annotation=inspect.Signature.empty)
+    mcp.tool()(encoded)
+    return fn
+
+def _run_upstream(fn, *args):
+    """Schedules a single upstream request on the worker pool and returns an awaitable for its result."""
+    return asyncio.get_running_loop().run_in_executor(_EXECUTOR, fn, *args)
+
+_inflight = {}
+_inflight_lock = Lock()
+
+def _single_flight(key, fn, *args, **kwargs):
+    """
+    Calls fn(*args, **kwargs), unless a call with the same key is already in flight,
+    in which case waits for that call and shares its result (or exception). This
+    caps upstream requests on a cold cache at one per key, however many tool calls
+    arrive at once.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = concurrent.futures.Future()
+    if not leader:
+        return future.result()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+@cached(_team_cache, lock=_team_cache_lock)
+def _lookup_team(team_name):
+    return _single_flight(("lookup_team", team_name), statsapi.lookup_team, team_name, activeStatus="Y")
+
+# None until first use; False when sentence-transformers is not installed.
+_embedding_model = None
+_embedding_model_lock = Lock()
+
+def _embed(text):
+    """
+    Returns the normalized sentence embedding of the text, or None when
+    sentence-transformers is not installed.
+    """
+    global _embedding_model
+    if _embedding_model is None:
+        with _embedding_model_lock:
+            if _embedding_model is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError:  # optional, installed with the "semantic" extra
+                    _embedding_model = False
+                else:
+                    _embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+    if _embedding_model is False:
+        return None
+    return _embedding_model.encode(text, normalize_embeddings=True)
+
+class _SemanticCache:
+    """
+    Bounded LRU cache keyed on query embeddings. A lookup hits when the cosine
+    similarity between the query and a cached query exceeds the threshold.
+    """
+    def __init__(self, maxsize=200, threshold=0.85):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def lookup(self, embedding):
+        if embedding is None:
+            return None
+        import numpy as np
+
+        with self._lock:
+            if not self._entries:
+                return None
+            keys = list(self._entries)
+            scores = np.stack([e for e, _ in self._entries.values()]) @ embedding
+            best = int(np.argmax(scores))
+            if scores[best] <= self.threshold:
+                return None
+            self._entries.move_to_end(keys[best])
+            return self._entries[keys[best]][1]
+
+    def add(self, query, embedding, value):
+        if embedding is None:
+            return
+        with self._lock:
+            self._entries[query] = (embedding, value)
+            self._entries.move_to_end(query)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+_team_sem_cache = _SemanticCache()
+
+# Local index of the active MLB teams, keyed by every lowercased name field statsapi
+# matches on. Built on first use with one request and refreshed once a day.
+_TEAM_INDEX_FIELDS = ('name', 'teamName', 'teamCode', 'fileCode', 'abbreviation', 'locationName', 'shortName')
+_TEAM_INDEX_TTL = 86400
+# After a failed build, team lookups skip the index for this long rather than each
+# retrying the build, one at a time, while upstream is down.
+_TEAM_INDEX_RETRY_SECONDS = 60
+# Whole-string similarity required for a fuzzy match. Partial scorers such as WRatio
+# rate anything containing a city name ("Detroit Lions") as a near-certain match.
+_TEAM_FUZZY_CUTOFF = 90
+_team_index = None
+_team_index_failed_at = None
+_team_index_lock = Lock()
+
+def _build_team_index():
+    global _team_index
+    teams = _single_flight(("lookup_team", ""), statsapi.lookup_team, "", activeStatus="Y")
+    index = {}
+    for team in teams:
+        for field in _TEAM_INDEX_FIELDS:
+            key = str(team.get(field) or '').lower()
+            if key and key not in index:
+                # Map each key to the team statsapi.lookup_team would return for it: the first
+                # team with any field containing the key. "la", the Dodgers' file code, is also
+                # part of "LA Angels", so it resolves to the Angels, as upstream.
+                index[key] = next(t for t in teams if any(key in str(v).lower() for v in t.values()))
+    _team_index = (teams, index, list(index), time.monotonic())
+    return _team_index
+
+def _refresh_team_index():
+    try:
+        _build_team_index()
+    except Exception:
+        log.warning("Refreshing the MLB team index failed", exc_info=True)
+
+def _team_index_failed_recently():
+    return _team_index_failed_at is not None and time.monotonic() - _team_index_failed_at < _TEAM_INDEX_RETRY_SECONDS
+
+def _team_index_snapshot():
+    """
+    Returns the current (teams, index, keys) of the team index, building it on first
+    use, or None when it could not be built in the last _TEAM_INDEX_RETRY_SECONDS.
+    Once it is older than _TEAM_INDEX_TTL it keeps being served while a background
+    refresh runs.
+    """
+    global _team_index, _team_index_failed_at
+    snapshot = _team_index
+    if snapshot is None:
+        if _team_index_failed_recently():
+            return None
+        with _team_index_lock:
+            snapshot = _team_index
+            if snapshot is None:
+                if _team_index_failed_recently():
+                    return None
+                try:
+                    snapshot = _build_team_index()
+                except Exception:
+                    _team_index_failed_at = time.monotonic()
+                    log.warning("Building the MLB team index failed, retrying in %ds",
+                                _TEAM_INDEX_RETRY_SECONDS, exc_info=True)
+                    return None
+    elif time.monotonic() - snapshot[3] > _TEAM_INDEX_TTL:
+        with _team_index_lock:
+            if _team_index is snapshot:
+                # Restart the clock so only one refresh is scheduled.
+                _team_index = snapshot[:3] + (time.monotonic(),)
+                _EXECUTOR.submit(_refresh_team_index)
+    return snapshot[:3]
+
+def _indexed_team(team_name):
+    """
+    Resolves a team name against the local team index: an exact name, nickname,
+    code or city first, then statsapi's substring match, both giving the team
+    statsapi.lookup_team would, then a close whole-string match for typos.
+    Returns (team, provenance), or (None, None) when nothing matches or the index
+    is unavailable.
+    """
+    snapshot = _team_index_snapshot()
+    if snapshot is None:
+        return None, None
+    teams, index, keys = snapshot
+    query = str(team_name).strip().lower()
+    team = index.get(query)
+    if team is not None:
+        return team, "index"
+    for team in teams:
+        if any(query in str(value).lower() for value in team.values()):
+            return team, "index"
+    match = process.extractOne(query, keys, scorer=fuzz.token_sort_ratio, score_cutoff=_TEAM_FUZZY_CUTOFF)
+    if match is not None:
+        return index[match[0]], "fuzzy"
+    return None, None
+
+_today_cache = {'date': None, 'ordinal': -1}
+
+def _today_str():
+    """
+    Returns today's date as YYYY-MM-DD. The string is built once per day rather
+    than on every tool call; it is also the canonical "today" used in cache keys.
+    """
+    now = datetime.now()
+    ordinal = now.toordinal()
+    if ordinal != _today_cache['ordinal']:
+        # Publish the date before the ordinal so a concurrent reader never pairs the
+        # new ordinal with yesterday's date.
+        _today_cache['date'] = f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
+        _today_cache['ordinal'] = ordinal
+    return _today_cache['date']
+
+# Date formats statsapi accepts.
+_DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y')
+
+def _date_format(value):
+    """Returns the format in _DATE_FORMATS the date is written in, or None."""
+    for fmt in _DATE_FORMATS:
+        try:
+            datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            continue
+        return fmt
+    return None
+
+def _parse_date(value):
+    """Parses a date in either format statsapi accepts, or returns None."""
+    fmt = _date_format(value)
+    return None if fmt is None else datetime.strptime(value, fmt).date()
+
+def _date_shards(start_date, end_date):
+    """
+    Splits a date range into consecutive ranges of at most _SCHEDULE_SHARD_DAYS
+    days, with the bounds written in the same format as start_date. Dates that
+    don't parse are passed through as one range.
+    """
+    fmt = _date_format(start_date)
+    start, end = _parse_date(start_date), _parse_date(end_date)
+    if start is None or end is None:
+        return [(start_date, end_date)]
+    shards = []
+    while start <= end:
+        shard_end = min(start + timedelta(days=_SCHEDULE_SHARD_DAYS - 1), end)
+        shards.append([start.strftime(fmt), shard_end.strftime(fmt)])
+        start = shard_end + timedelta(days=1)
+    if not shards:
+        return [(start_date, end_date)]
+    # Keep the caller's own strings on the outer bounds, so an unsplit range is
+    # requested (and cached) exactly as given.
+    shards[0][0], shards[-1][1] = start_date, end_date
+    return [tuple(shard) for shard in shards]
+
+# Health of the schedule endpoint. An upstream request counts as a failure when it
+# raises or takes longer than _SLOW_REQUEST_SECONDS; after more than _FAIL_STREAK_LIMIT
+# in a row, shards with a last good result are served from it and refreshed in the
+# background. Callers sharing a request through _single_flight count once.
+_SLOW_REQUEST_SECONDS = 0.5
+_FAIL_STREAK_LIMIT = 3
+_schedule_health = {'fail_streak': 0}
+_schedule_health_lock = Lock()
+# Shards with a background refresh queued or running, so each has at most one.
+_refreshing_schedules = set()
+
+def _record_schedule_health(ok, elapsed):
+    with _schedule_health_lock:
+        if ok and elapsed <= _SLOW_REQUEST_SECONDS:
+            _schedule_health['fail_streak'] = 0
+        else:
+            _schedule_health['fail_streak'] += 1
+
+def _schedule_degraded():
+    with _schedule_health_lock:
+        return _schedule_health['fail_streak'] > _FAIL_STREAK_LIMIT
+
+def _is_server_error(e):
+    response = getattr(e, "response", None)
+    return isinstance(e, requests.HTTPError) and response is not None and response.status_code >= 500
+
+@retry(
+    retry=retry_if_exception(_is_server_error),
+    stop=stop_after_attempt(2) | stop_after_delay(_REQUEST_TIMEOUT),
+    wait=wait_exponential(multiplier=0.2, max=2),
+    reraise=True,
+)
+def _fetch_schedule_shard(start_date, end_date, team_id=None):
+    if team_id is not None:
+        return statsapi.schedule(team=team_id, start_date=start_date, end_date=end_date)
+    return statsapi.schedule(start_date=start_date, end_date=end_date)
+
+def _fetch_schedule_shard_tracked(key, start_date, end_date, team_id=None):
+    """
+    Fetches a schedule shard, records the endpoint's health and updates the fallback
+    caches. Runs once per upstream request, in the _single_flight leader.
+    """
+    started = time.monotonic()
+    try:
+        games = _fetch_schedule_shard(start_date, end_date, team_id)
+    except Exception:
+        _record_schedule_health(False, time.monotonic() - started)
+        raise
+    _record_schedule_health(True, time.monotonic() - started)
+    with _schedule_fallback_lock:
+        if games:
+            _last_good_schedules[key] = games
+        else:
+            _neg_cache[key] = games
+    return games
+
+def _fetch_schedule_shard_shared(key, start_date, end_date, team_id=None):
+    return _single_flight(key, _fetch_schedule_shard_tracked, key, start_date, end_date, team_id)
+
+def _refresh_schedule_shard(key, start_date, end_date, team_id=None):
+    try:
+        _fetch_schedule_shard_shared(key, start_date, end_date, team_id)
+    except Exception:
+        log.warning("Background refresh of schedule %s to %s failed", start_date, end_date, exc_info=True)
+    finally:
+        with _schedule_fallback_lock:
+            _refreshing_schedules.discard(key)
+
+def _request_schedule_shard(start_date, end_date, team_id=None):
+    key = ("schedule", start_date, end_date, team_id)
+    with _schedule_fallback_lock:
+        if key in _neg_cache:
+            return []
+        last_good = _last_good_schedules.get(key)
+    if last_good is not None and _schedule_degraded():
+        with _schedule_fallback_lock:
+            refresh = key not in _refreshing_schedules
+            _refreshing_schedules.add(key)
+        if refresh:
+            _EXECUTOR.submit(_refresh_schedule_shard, key, start_date, end_date, team_id)
+        return last_good
+    try:
+        return _fetch_schedule_shard_shared(key, start_date, end_date, team_id)
+    except Exception:
+        if last_good is None:
+            raise
+        log.warning("Schedule %s to %s failed, serving the last good result", start_date, end_date, exc_info=True)
+        return last_good
+
+def _request_schedule(start_date, end_date, team_id=None):
+    shards = _date_shards(start_date, end_date)
+    if len(shards) == 1:
+        return _request_schedule_shard(*shards[0], team_id)
+    futures = [_EXECUTOR.submit(_request_schedule_shard, start, end, team_id) for start, end in shards]
+    return [game for future in futures for game in future.result()]
+
+@_DISK.memoize(name=f"schedule:{_PAYLOAD_VERSION}", typed=True, expire=None)
+def _disk_schedule(start_date, end_date, team_id=None):
+    return _request_schedule(start_date, end_date, team_id)
+
+@cached(_schedule_cache, lock=RLock())
+def _cached_schedule(start_date, end_date, team_id=None):
+    return _request_schedule(start_date, end_date, team_id)
+
+@cached(_live_schedule_cache, lock=RLock())
+def _cached_live_schedule(start_date, end_date, team_id=None):
+    return _request_schedule(start_date, end_date, team_id)
+
+def _team_key(team_id):
+    """
+    Normalizes a team id, or a comma-separated list of team ids, to a sorted
+    comma-separated string so equivalent requests share one cache entry.
+    """
+    if team_id is None:
+        return None
+    return ",".join(str(t) for t in sorted({int(t) for t in str(team_id).split(",")}))
+
+# Game states that no longer change, so a schedule made only of them can be persisted.
+_SETTLED_STATUSES = ("Final", "Postponed", "Cancelled")
+
+def _schedule(start_date, end_date, team_id=None):
+    """
+    Returns the schedule for the date range. Ranges ending two or more days ago are
+    served from the persistent disk cache. A range ending yesterday may still hold
+    late games in progress, so it is persisted only once all of its games are
+    settled. Ranges covering today use the short-lived cache since games in progress
+    change by the minute, and dates that don't parse never reach the disk cache.
+    """
+    team_id = _team_key(team_id)
+    start, end = _parse_date(start_date), _parse_date(end_date)
+    if start is None or end is None:
+        return _cached_schedule(start_date, end_date, team_id)
+    today = _parse_date(_today_str())
+    if end < today - timedelta(days=1):
+        return _disk_schedule(start_date, end_date, team_id)
+    if end < today:
+        key = _disk_schedule.__cache_key__(start_date, end_date, team_id)
+        games = _DISK.get(key)
+        if games is None:
+            games = _cached_live_schedule(start_date, end_date, team_id)
+            if all(game['status'] in _SETTLED_STATUSES for game in games):
+                _DISK.set(key, games)
+        return games
+    if start <= today:
+        return _cached_live_schedule(start_date, end_date, team_id)
+    return _cached_schedule(start_date, end_date, team_id)
+
+@cached(_game_cache, key=partial(hashkey, "scoring_plays"), lock=_game_cache_lock)
+def _game_scoring_plays(game_id):
+    return _single_flight(("game_scoring_plays", game_id), statsapi.game_scoring_plays, game_id)
+
+@cached(_game_cache, key=partial(hashkey, "highlights"), lock=_game_cache_lock)
+def _game_highlights(game_id):
+    return _single_flight(("game_highlights", game_id), statsapi.game_highlights, game_id)
+
+@cached(_player_cache, key=partial(hashkey, "lookup_player"), lock=_player_cache_lock)
+def _lookup_player(lookup_value):
+    return _single_flight(("lookup_player", lookup_value), statsapi.lookup_player, lookup_value)
+
+_register = None
+_register_lock = Lock()
+
+def _player_register():
+    """
+    Loads the Chadwick player register once, along with lowercased name columns
+    used for matching.
+    """
+    global _register
+    if _register is None:
+        with _register_lock:
+            if _register is None:
+                from pybaseball import chadwick_register
+
+                frame = chadwick_register()
+                last = frame['name_last'].fillna('').str.lower().to_numpy()
+                first = frame['name_first'].fillna('').str.lower().to_numpy()
+                _register = {
+                    "frame": frame,
+                    "last": last,
+                    "first": first,
+                    "full": [f"{f} {l}".strip() for f, l in zip(first, last)],
+                }
+    return _register
+
+def _register_records(frame):
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+@cached(_player_cache, key=partial(hashkey, "playerid_lookup"), lock=_player_cache_lock)
+def _playerid_lookup(last_name=None, first_name=None, fuzzy=False):
+    import numpy as np
+
+    register = _player_register()
+    mask = np.ones(len(register["last"]), dtype=bool)
+    if last_name is not None:
+        mask &= register["last"] == last_name.strip().lower()
+    if first_name is not None:
+        mask &= register["first"] == first_name.strip().lower()
+    if mask.any() or not fuzzy:
+        return _register_records(register["frame"][mask])
+
+    query = " ".join(n.strip() for n in (first_name, last_name) if n is not None).lower()
+    matches = process.extract(query, register["full"], scorer=fuzz.WRatio, limit=10)
+    return _register_records(register["frame"].iloc[[index for _, _, index in matches]])
+
+@_DISK.memoize(name=f"game_pace:{_PAYLOAD_VERSION}", typed=True, expire=None)
+def _disk_game_pace(season):
+    return _single_flight(("game_pace", season), statsapi.game_pace, season)
+
+@cached(_pace_cache, lock=RLock())
+def _cached_game_pace(season):
+    return _single_flight(("game_pace", season), statsapi.game_pace, season)
+
+def _game_pace(season):
+    """
+    Returns the game pace for the season. Completed seasons never change, so they
+    are served from the persistent disk cache.
+    """
+    try:
+        completed = int(season) < int(_today_str()[:4])
+    except (TypeError, ValueError):
+        completed = False
+    if completed:
+        return _disk_game_pace(int(season))
+    return _cached_game_pace(season)
+
+async def _game_results(game_ids):
+    """
+    Fetches the scoring plays and highlights of each game concurrently.
+
+    Returns:
+        dict: A dictionary mapping each game id to its "scoring_plays" and "game_highlights".
+    """
+    game_ids = list(game_ids)
+    fetched = await asyncio.gather(*(
+        _run_upstream(fetch, game_id)
+        for game_id in game_ids
+        for fetch in (_game_scoring_plays, _game_highlights)
+    ))
+    return {
+        game_id: {
+            "scoring_plays": fetched[2 * i],
+            "game_highlights": fetched[2 * i + 1]
+        }
+        for i, game_id in enumerate(game_ids)
+    }
+
+# Schedule fields returned by get_mlb_schedule unless the caller asks for others.
+_SCHEDULE_FIELDS = (
+    'game_id', 'game_date', 'game_datetime', 'status',
+    'home_id', 'home_name', 'home_score', 'away_id', 'away_name', 'away_score',
+    'winning_team', 'losing_team', 'winning_pitcher', 'current_inning',
+)
+# Every field statsapi.schedule fills under _SCHEDULE_HYDRATE, the only ones get_mlb_schedule
+# accepts. The broadcast and pitcher note fields need the hydrations trimmed from the
+# request, so they would always come back empty.
+_SCHEDULE_AVAILABLE_FIELDS = frozenset(_SCHEDULE_FIELDS + (
+    'game_type', 'doubleheader', 'game_num', 'home_probable_pitcher', 'away_probable_pitcher',
+    'inning_state', 'venue_id', 'venue_name', 'series_status', 'losing_pitcher', 'save_pitcher', 'summary',
+))
+
+# Schedule fields reported by get_daily_results, mapped to the names it reports them under.
+_DAILY_RESULT_COLUMNS = {
+    "game_date": "date",
+    "home_name": "home_team",
+    "home_score": "home_score",
+    "away_name": "away_team",
+    "away_score": "away_score",
+    "winning_team": "winning_team",
+    "losing_team": "losing_team",
+    "winning_pitcher": "MVP",
+}
+
 def find_games_by_team_id(games_data, team_id):
     """
     Finds games in a list of game data where the given team is either the home or away team.
@@ -25,7 +681,28 @@ def find_games_by_team_id(games_data, team_id):
         if game['home_id'] == team_id or game['away_id'] == team_id:
             return game
     return None
-@mcp.tool()
+
+def build_team_game_index(games_data):
+    """
+    Indexes a list of game data by team, so several teams can be looked up against
+    the same schedule without rescanning it.
+
+    Args:
+        games_data: A list of dictionaries, where each dictionary represents a game
+                    and contains keys like 'home_id' and 'away_id'.
+
+    Returns:
+        dict: A dictionary mapping each team id to the list of games in which that team
+              is playing (either as home or away team), in schedule order.
+    """
+    index = {}
+    for game in games_data:
+        index.setdefault(game['home_id'], []).append(game)
+        index.setdefault(game['away_id'], []).append(game)
+    return index
+
+@_tool
+@_in_thread
 def look_up_team(team_name):
     """
     Looks up an MLB team by name.
@@ -35,12 +712,41 @@ def look_up_team(team_name):
 
     Returns:
         dict: A dictionary containing information about the team, such as its ID, name, abbreviation, and other relevant details.
+              The "cache_hit" field tells where the answer came from: "index" or "fuzzy" for the local index of
+              active teams, "exact" or "semantic" for a cached lookup, False for a fresh request to the MLB Stats API.
+
+    Raises:
+        ValueError: If no active MLB team matches the name.
     """
-    teams = statsapi.lookup_team(team_name, activeStatus="Y")
-    print(teams)
-    return teams[0]
+    team, provenance = _indexed_team(team_name)
+    if team is not None:
+        if provenance == "index":
+            # Remember confident index answers, so rephrasings the index can't match
+            # ("the Dodgers" after "LA Dodgers") are still answered locally.
+            _team_sem_cache.add(team_name, _embed(team_name), team)
+        return {**team, "cache_hit": provenance}
+
+    with _team_cache_lock:
+        teams = _team_cache.get(hashkey(team_name))
+    if teams:
+        return {**teams[0], "cache_hit": "exact"}
+
+    embedding = _embed(team_name)
+    team = _team_sem_cache.lookup(embedding)
+    # Team names sharing a city embed close together ("New York Mets" vs "New York Yankees"),
+    # so a semantic hit only counts when the query also names the team itself.
+    if team is not None and team['teamName'].lower() in team_name.lower():
+        return {**team, "cache_hit": "semantic"}
 
-@mcp.tool()
+    teams = _lookup_team(team_name)
+    log.debug("statsapi.lookup_team(%r) returned %s", team_name, teams)
+    if not teams:
+        raise ValueError("no team matching %r" % team_name)
+    _team_sem_cache.add(team_name, embedding, teams[0])
+    return {**teams[0], "cache_hit": False}
+
+@_tool
+@_in_thread
 def get_daily_results(date=None):
     """Fetch MLB game results for a given date (default is today)
        Args:
@@ -48,53 +754,61 @@ def get_daily_results(date=None):
        Returns:
          list: A list of dictionaries containing game details.
     """
+    import pandas as pd
+
     if date is None:
-        date = datetime.today().strftime('%Y-%m-%d')  # Default to today
-
-    schedule = statsapi.schedule(start_date=date, end_date=date)
-    
-    results = []
-    for game in schedule:
-        if game['status'] == "Final":
-            result = {
-                "date": game["game_date"],
-                "home_team": game["home_name"],
-                "home_score": game["home_score"],
-                "away_team": game["away_name"],
-                "away_score": game["away_score"],
-                "winning_team": game["winning_team"],
-                "losing_team": game["losing_team"],
-                "MVP": game.get("winning_pitcher", "N/A")
-            }
-            results.append(result)
-
-    return results
-
-@mcp.tool()
-def get_mlb_schedule(start_date=None, end_date=None, team_id=None):
+        date = _today_str()  # Default to today
+
+    schedule = pd.DataFrame(_schedule(date, date))
+    if schedule.empty:
+        return []
+
+    results = schedule.loc[schedule['status'].to_numpy() == "Final"]
+    results = results.reindex(columns=list(_DAILY_RESULT_COLUMNS)).rename(columns=_DAILY_RESULT_COLUMNS)
+    results["MVP"] = results["MVP"].fillna("N/A")
+    return results.astype(object).where(results.notna(), None).to_dict('records')
+
+@_tool
+@_in_thread
+def get_mlb_schedule(start_date=None, end_date=None, team_id=None, fields: list[str] | None = None):
     """
     Retrieves the MLB game schedule for a specified date range, optionally for a specific team.
 
     Args:
         start_date (str, optional): The start date for the schedule (YYYY-MM-DD). Defaults to today.
         end_date (str, optional): The end date for the schedule (YYYY-MM-DD). Defaults to today.
-        team_id (int, optional): The ID of the team to get the schedule for. Defaults to None (all teams).
+        team_id (int, optional): The ID of the team to get the schedule for, or a comma-separated string of IDs.
+                                 Defaults to None (all teams).
+        fields (list, optional): The game fields to return. Defaults to game ID, date and time, status, home and away
+                                 team IDs, names and scores, winning/losing team, winning pitcher and current inning.
+                                 Available fields: game_id, game_date, game_datetime, game_type, status, doubleheader,
+                                 game_num, home_id, home_name, home_score, home_probable_pitcher, away_id, away_name,
+                                 away_score, away_probable_pitcher, current_inning, inning_state, venue_id,
+                                 venue_name, series_status, winning_team, losing_team, winning_pitcher,
+                                 losing_pitcher, save_pitcher, summary.
 
     Returns:
         list: A list of dictionaries, where each dictionary represents a game in the schedule.
               Each game dictionary contains details like game ID, date, time, home team, away team, etc.
+              Fields that do not apply to a game (e.g. the winning team of a game not yet played) are None.
+
+    Raises:
+        ValueError: If fields names a field that is not available.
     """
+    if fields is not None:
+        unknown = sorted(set(fields) - _SCHEDULE_AVAILABLE_FIELDS)
+        if unknown:
+            raise ValueError("unknown schedule fields: %s" % ", ".join(unknown))
     if start_date is None:
-        start_date = datetime.today().strftime('%Y-%m-%d')
+        start_date = _today_str()
     if end_date is None:
-        end_date = datetime.today().strftime('%Y-%m-%d')
-    if team_id is not None:
-        return statsapi.schedule(team=team_id, start_date=start_date, end_date=end_date)
-    
-    return statsapi.schedule(start_date=start_date, end_date=end_date)
+        end_date = _today_str()
+    fields = _SCHEDULE_FIELDS if fields is None else tuple(fields)
+    # Not operator.itemgetter: winning/losing fields are only present on finished games.
+    return [{k: game.get(k) for k in fields} for game in _schedule(start_date, end_date, team_id)]
 
-@mcp.tool()
-def mlb_team_result(team_name, date=None):
+@_tool
+async def mlb_team_result(team_name, date=None):
     """
     Retrieves the results (scoring plays and highlights) for a specific MLB team's most recent game.
 
@@ -110,23 +824,67 @@ def mlb_team_result(team_name, date=None):
                           "game_highlights": list  # List of game highlights
                       }
     """
-    teamInfo = look_up_team(team_name)
-    games = get_mlb_schedule(start_date=date, end_date=date, team_id=teamInfo['id'])
-    game = find_games_by_team_id(games, teamInfo['id'])
+    teamInfo = await look_up_team(team_name)
+    games = await get_mlb_schedule(start_date=date, end_date=date, team_id=teamInfo['id'])
+    # The schedule is already filtered to this team upstream, so no scan is needed.
+    game = games[0] if games else None
 
     if (game):
-        gamePk = game['game_id']
-        result = {
-            "scoring_plays": statsapi.game_scoring_plays(gamePk),
-            "game_highlights": statsapi.game_highlights(gamePk)
-        }
-
-        return result
+        return (await _game_results([game['game_id']]))[game['game_id']]
     else:
         return None
-    
-@mcp.tool()
-def player_id_lookup(last_name: str = None, first_name: str = None, fuzzy: bool = False) -> pd.DataFrame:
+
+@_tool
+async def get_mlb_schedules_batch(team_ids: list[int], start_date=None, end_date=None):
+    """
+    Retrieves the MLB game schedules of several teams for a specified date range with a single upstream request.
+
+    Args:
+        team_ids (list): The IDs of the teams to get the schedules for.
+        start_date (str, optional): The start date for the schedule (YYYY-MM-DD). Defaults to today.
+        end_date (str, optional): The end date for the schedule (YYYY-MM-DD). Defaults to today.
+
+    Returns:
+        list: A list of dictionaries, one per requested team, with the structure:
+              {
+                  "team_id": int,  # The requested team ID
+                  "games": list  # The team's games, in the same format as get_mlb_schedule
+              }
+    """
+    team_ids = [int(t) for t in team_ids]
+    if not team_ids:
+        return []
+    games = await get_mlb_schedule(start_date=start_date, end_date=end_date, team_id=",".join(map(str, team_ids)))
+    index = build_team_game_index(games)
+    return [{"team_id": t, "games": index.get(t, [])} for t in team_ids]
+
+@_tool
+async def mlb_team_results_batch(team_names: list[str], date=None):
+    """
+    Retrieves the results (scoring plays and highlights) of several MLB teams' most recent games at once.
+
+    Args:
+        team_names (list): The names of the MLB teams (e.g., ["Los Angeles Dodgers", "New York Yankees"]).
+        date (str, optional): The date for the schedule (YYYY-MM-DD). Defaults to today.
+    Returns:
+        list: A list of dictionaries, one per requested team, with the structure:
+              {
+                  "team": str,  # The requested team name
+                  "result": dict or None  # Same as the return value of mlb_team_result
+              }
+    """
+    teams = await asyncio.gather(*(look_up_team(name) for name in team_names))
+    schedules = await get_mlb_schedules_batch([t['id'] for t in teams], start_date=date, end_date=date)
+    games = [s["games"][0] if s["games"] else None for s in schedules]
+    results = await _game_results({g['game_id'] for g in games if g})
+    return [
+        {"team": name, "result": results[g['game_id']] if g else None}
+        for name, g in zip(team_names, games)
+    ]
+
+@_tool
+@_in_thread
+def player_id_lookup(last_name: str = None, first_name: str = None, fuzzy: bool = False) -> list[dict] | None:
     """
     Look up player IDs based on last name, first name, and fuzzy matching.
 
@@ -136,20 +894,22 @@ def player_id_lookup(last_name: str = None, first_name: str = None, fuzzy: bool
         fuzzy (bool, optional): Whether to use fuzzy matching for the lookup. Defaults to False.
 
     Returns:
-        pd.DataFrame: A DataFrame containing the player information based on the provided criteria.
+        list: A list of dictionaries, one per matching player, containing the player's name and ids
+              (MLBAM, Retrosheet, Baseball-Reference, FanGraphs) and first/last MLB seasons.
     """
     if last_name is not None and first_name is not None:
-        data = playerid_lookup(last_name, first_name, fuzzy=False)
+        data = _playerid_lookup(last_name, first_name, fuzzy=False)
     elif last_name is not None and first_name is None:
-        data = playerid_lookup(last_name, fuzzy=True)
+        data = _playerid_lookup(last_name, fuzzy=True)
     elif last_name is None and first_name is not None:
-        data = playerid_lookup(first_name, fuzzy=True)
+        data = _playerid_lookup(first_name=first_name, fuzzy=True)
     else:
         return None
 
     return data
 
-@mcp.tool()
+@_tool
+@_in_thread
 def get_player_info(lookup_value) -> dict:
     """
     Retrieve player information based on the lookup value.
@@ -161,13 +921,14 @@ def get_player_info(lookup_value) -> dict:
         dict: A dictionary containing the player's information, including name, team, position, and other relevant details.
     """
     try:
-        player_info = statsapi.lookup_player(lookup_value)
+        player_info = _lookup_player(lookup_value)
         return player_info
-    except Exception as e:
-        print(f"Error retrieving player information: {e}")
-        return None
+    except Exception:
+        log.exception("statsapi.lookup_player(%r) failed", lookup_value)
+        raise
 
-@mcp.tool()
+@_tool
+@_in_thread
 def get_game_highlights(game_id) -> list:
     """
     Retrieve game highlights based on the provided game ID.
@@ -179,14 +940,15 @@ def get_game_highlights(game_id) -> list:
         list: A list of highlights for the specified game, including descriptions and media links.
     """
     try:
-        highlights = statsapi.game_highlights(game_id)
+        highlights = _game_highlights(game_id)
         return highlights
-    except Exception as e:
-        print(f"Error retrieving game highlights: {e}")
-        return None
+    except Exception:
+        log.exception("statsapi.game_highlights(%r) failed", game_id)
+        raise
 
 
-@mcp.tool()
+@_tool
+@_in_thread
 def game_pace(season):
     """
     MCP wrapper for statsapi.game_pace.
@@ -240,7 +1002,7 @@ def game_pace(season):
             timePerExtraInnGame: 03:43:36
     """
     try:
-        return statsapi.game_pace(season)
-    except Exception as e:
-        print(f"Error calling statsapi.game_pace: {e}")
-        return None
+        return _game_pace(season)
+    except Exception:
+        log.exception("statsapi.game_pace(%r) failed", season)
+        raise
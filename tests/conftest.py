@@ -0,0 +1,36 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Always keep the persistent cache in a throwaway directory while testing, even when
+# MCP_MLB_CACHE_DIR is exported: the fixtures below clear it before every test.
+_CACHE_DIR = tempfile.mkdtemp(prefix="mcp_mlb_test_")
+os.environ["MCP_MLB_CACHE_DIR"] = _CACHE_DIR
+
+from mcp_mlb_statsapi import server  # noqa: E402
+
+
+def pytest_sessionfinish(session, exitstatus):
+    server._DISK.close()
+    shutil.rmtree(_CACHE_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in (
+        server._schedule_cache,
+        server._live_schedule_cache,
+        server._game_cache,
+        server._team_cache,
+        server._player_cache,
+        server._pace_cache,
+        server._neg_cache,
+        server._last_good_schedules,
+    ):
+        cache.clear()
+    server._DISK.clear()
+    server._schedule_health['fail_streak'] = 0
+    server._refreshing_schedules.clear()
+    yield
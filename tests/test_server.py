@@ -0,0 +1,474 @@
+import asyncio
+import contextlib
+import os
+import socket
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+import statsapi
+
+from mcp_mlb_statsapi import server
+
+TODAY = "2026-10-14"
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Replaces the schedule request with a stub returning `upstream.games`."""
+    class Upstream:
+        games = [{"game_id": 1, "status": "Final"}]
+        calls = []
+
+    def request_schedule(start_date, end_date, team_id=None):
+        Upstream.calls.append((start_date, end_date, team_id))
+        return Upstream.games
+
+    Upstream.calls = []
+    monkeypatch.setattr(server, "_request_schedule", request_schedule)
+    monkeypatch.setattr(server, "_today_str", lambda: TODAY)
+    return Upstream
+
+
+def _persisted(start_date, end_date, team_id=None):
+    return server._disk_schedule.__cache_key__(start_date, end_date, team_id) in server._DISK
+
+
+@pytest.mark.parametrize("start_date, end_date", [
+    ("10/14/2026", "10/14/2026"),
+    ("12/31/2026", "12/31/2026"),
+    ("2026-10-14", "2026-10-14"),
+    ("2026-10-01", "2026-10-20"),
+    ("2026-12-31", "2026-12-31"),
+    ("yesterday", "today"),
+])
+def test_schedule_not_persisted_for_current_or_future_dates(upstream, start_date, end_date):
+    server._schedule(start_date, end_date)
+    assert not _persisted(start_date, end_date)
+
+
+@pytest.mark.parametrize("start_date, end_date", [
+    ("2026-10-01", "2026-10-12"),
+    ("10/01/2026", "10/12/2026"),
+])
+def test_schedule_persisted_for_past_dates(upstream, start_date, end_date):
+    upstream.games = [{"game_id": 1, "status": "In Progress"}]
+    server._schedule(start_date, end_date)
+    assert _persisted(start_date, end_date)
+
+
+def test_schedule_ending_yesterday_not_persisted_while_games_in_progress(upstream):
+    upstream.games = [{"game_id": 1, "status": "Final"}, {"game_id": 2, "status": "In Progress"}]
+    server._schedule("2026-10-13", "2026-10-13")
+    assert not _persisted("2026-10-13", "2026-10-13")
+
+
+def test_schedule_ending_yesterday_persisted_once_settled(upstream):
+    upstream.games = [
+        {"game_id": 1, "status": "Final"},
+        {"game_id": 2, "status": "Postponed"},
+        {"game_id": 3, "status": "Cancelled"},
+    ]
+    assert server._schedule("2026-10-13", "2026-10-13") == upstream.games
+    assert _persisted("2026-10-13", "2026-10-13")
+
+    server._live_schedule_cache.clear()
+    server._schedule("2026-10-13", "2026-10-13")
+    assert len(upstream.calls) == 1
+
+
+def test_disk_cache_directory_is_private():
+    mode = stat.S_IMODE(os.stat(server._DISK_CACHE_DIR).st_mode)
+    assert mode == 0o700
+
+
+def _tool_properties(name):
+    tools = asyncio.run(server.mcp.list_tools())
+    return next(tool for tool in tools if tool.name == name).inputSchema["properties"]
+
+
+def test_batch_tools_advertise_list_parameters():
+    team_ids = _tool_properties("get_mlb_schedules_batch")["team_ids"]
+    assert team_ids["type"] == "array"
+    assert team_ids["items"]["type"] == "integer"
+
+    team_names = _tool_properties("mlb_team_results_batch")["team_names"]
+    assert team_names["type"] == "array"
+    assert team_names["items"]["type"] == "string"
+
+
+def test_schedule_tool_advertises_list_fields():
+    fields = _tool_properties("get_mlb_schedule")["fields"]
+    assert {"type": "array", "items": {"type": "string"}} in fields["anyOf"]
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Replaces the pooled session with a stub recording each request."""
+    class Response:
+        status_code = 200
+        content = b'{"dates": []}'
+
+    class Session:
+        requests = []
+
+        def get(self, url, **kwargs):
+            self.requests.append((url, kwargs))
+            return Response()
+
+    fake = Session()
+    monkeypatch.setattr(server, "_session", fake)
+    return fake
+
+
+def test_statsapi_requests_get_a_default_timeout(session):
+    statsapi.requests.get("https://statsapi.mlb.com/api/v1/teams")
+    assert session.requests[-1][1]["timeout"] == server._REQUEST_TIMEOUT
+
+    statsapi.requests.get("https://statsapi.mlb.com/api/v1/teams", timeout=3)
+    assert session.requests[-1][1]["timeout"] == 3
+
+
+def _sent_query(session):
+    return parse_qs(urlsplit(session.requests[-1][0]).query)
+
+
+def test_schedule_hydrate_trimmed_and_series_status_kept(session):
+    statsapi.schedule(start_date="2026-07-01", end_date="2026-07-01")
+    assert _sent_query(session)["hydrate"] == ["decisions,probablePitcher,linescore,seriesStatus"]
+
+
+def test_schedule_hydrate_trimmed_without_series_status(session):
+    # statsapi leaves seriesStatus out of ranges including 2014-03-11.
+    statsapi.schedule(start_date="2014-03-11", end_date="2014-03-11")
+    assert _sent_query(session)["hydrate"] == ["decisions,probablePitcher,linescore"]
+
+
+def test_highlights_schedule_url_left_alone(session):
+    with contextlib.suppress(Exception):
+        statsapi.game_highlight_data(776000)
+    url = session.requests[-1][0]
+    assert urlsplit(url).path.endswith("/schedule")
+    assert url == server._trim_schedule_hydrate(url)
+    assert _sent_query(session)["hydrate"] == ["game(content(highlights(highlights)))"]
+
+
+@pytest.mark.parametrize("start_date, end_date", [("2024-01-01", "2024-12-31"), ("01/01/2024", "12/31/2024")])
+def test_date_shards_split_long_ranges_in_either_format(start_date, end_date):
+    shards = server._date_shards(start_date, end_date)
+    assert len(shards) == 12
+    assert shards[0][0] == start_date and shards[-1][1] == end_date
+    days = [(server._parse_date(end) - server._parse_date(start)).days + 1 for start, end in shards]
+    assert max(days) <= server._SCHEDULE_SHARD_DAYS and sum(days) == 366
+    assert all(server._date_format(bound) == server._date_format(start_date) for shard in shards for bound in shard)
+
+
+def test_date_shards_pass_short_and_unparseable_ranges_through():
+    assert server._date_shards("10/01/2024", "10/05/2024") == [("10/01/2024", "10/05/2024")]
+    assert server._date_shards("yesterday", "today") == [("yesterday", "today")]
+
+
+def _team(team_id, name, team_code, file_code, team_name, location_name, short_name):
+    return {
+        "id": team_id, "name": name, "teamCode": team_code, "fileCode": file_code,
+        "teamName": team_name, "locationName": location_name, "shortName": short_name,
+    }
+
+
+# A subset of statsapi.lookup_team("", activeStatus="Y"), in upstream (name) order.
+TEAMS = [
+    _team(111, "Boston Red Sox", "bos", "bos", "Red Sox", "Boston", "Boston"),
+    _team(112, "Chicago Cubs", "chn", "chc", "Cubs", "Chicago", "Chi Cubs"),
+    _team(145, "Chicago White Sox", "cha", "cws", "White Sox", "Chicago", "Chi White Sox"),
+    _team(116, "Detroit Tigers", "det", "det", "Tigers", "Detroit", "Detroit"),
+    _team(108, "Los Angeles Angels", "ana", "ana", "Angels", "Anaheim", "LA Angels"),
+    _team(119, "Los Angeles Dodgers", "lan", "la", "Dodgers", "Los Angeles", "LA Dodgers"),
+    _team(121, "New York Mets", "nyn", "nym", "Mets", "Queens", "NY Mets"),
+    _team(147, "New York Yankees", "nya", "nyy", "Yankees", "Bronx", "NY Yankees"),
+    _team(136, "Seattle Mariners", "sea", "sea", "Mariners", "Seattle", "Seattle"),
+]
+
+
+@pytest.fixture
+def team_index(monkeypatch):
+    def lookup_team(lookup_value, activeStatus="Y"):
+        return [t for t in TEAMS if any(str(lookup_value).lower() in str(v).lower() for v in t.values())]
+
+    monkeypatch.setattr(statsapi, "lookup_team", lookup_team)
+    monkeypatch.setattr(server, "_team_index", None)
+    monkeypatch.setattr(server, "_team_index_failed_at", None)
+    monkeypatch.setattr(server, "_team_sem_cache", server._SemanticCache())
+    return lookup_team
+
+
+@pytest.mark.parametrize("query", [
+    "Dodgers", "la", "LA", "Los Angeles", "new york", "Chicago", "sox", "nyy", "Bronx", "Seattle",
+])
+def test_indexed_team_matches_statsapi_lookup_team(team_index, query):
+    team, provenance = server._indexed_team(query)
+    assert provenance == "index"
+    assert team == team_index(query)[0]
+
+
+@pytest.mark.parametrize("query, team_id", [("yankes", 147), ("dodgrs", 119), ("Marinrs", 136)])
+def test_indexed_team_fuzzy_matches_typos(team_index, query, team_id):
+    team, provenance = server._indexed_team(query)
+    assert (team["id"], provenance) == (team_id, "fuzzy")
+
+
+@pytest.mark.parametrize("query", ["Detroit Lions", "Boston Celtics", "Chicago Bulls", "Seattle Kraken"])
+def test_indexed_team_rejects_other_sports(team_index, query):
+    assert server._indexed_team(query) == (None, None)
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    """Embeds every query naming the Dodgers alike, and anything else elsewhere."""
+    import numpy as np
+
+    monkeypatch.setattr(server, "_embed", lambda text: np.array([1.0, 0.0] if "dodgers" in text.lower() else [0.0, 1.0]))
+
+
+def _look_up_team(team_name):
+    return asyncio.run(server.look_up_team(team_name))
+
+
+def test_index_hits_answer_rephrased_lookups_semantically(team_index, embeddings, monkeypatch):
+    assert _look_up_team("LA Dodgers")["cache_hit"] == "index"
+    monkeypatch.setattr(statsapi, "lookup_team", lambda *args, **kwargs: pytest.fail("asked upstream"))
+    team = _look_up_team("the Dodgers")
+    assert (team["id"], team["cache_hit"]) == (119, "semantic")
+
+
+def test_look_up_team_without_a_match_raises(team_index, embeddings):
+    with pytest.raises(ValueError, match="no team matching 'Detroit Lions'"):
+        _look_up_team("Detroit Lions")
+
+
+def test_failed_team_index_build_is_not_retried_until_backoff(team_index, monkeypatch):
+    builds = []
+
+    def lookup_team(lookup_value, activeStatus="Y"):
+        if lookup_value == "":
+            builds.append(1)
+            raise requests.ConnectionError("upstream down")
+        return team_index(lookup_value)
+
+    monkeypatch.setattr(statsapi, "lookup_team", lookup_team)
+    assert _look_up_team("Yankees")["cache_hit"] is False
+    assert _look_up_team("Mets")["cache_hit"] is False
+    assert len(builds) == 1
+
+    monkeypatch.setattr(server, "_team_index_failed_at", time.monotonic() - server._TEAM_INDEX_RETRY_SECONDS)
+    monkeypatch.setattr(statsapi, "lookup_team", team_index)
+    assert _look_up_team("Mariners")["cache_hit"] == "index"
+
+
+class _Arrivals(dict):
+    """Stands in for server._inflight and counts the callers that have looked a key up."""
+    def __init__(self):
+        super().__init__()
+        self._count = 0
+        self._changed = threading.Condition()
+
+    def get(self, key, default=None):
+        with self._changed:
+            self._count += 1
+            self._changed.notify_all()
+        return super().get(key, default)
+
+    def wait_for(self, count):
+        with self._changed:
+            assert self._changed.wait_for(lambda: self._count >= count, timeout=5)
+
+
+@pytest.fixture
+def arrivals(monkeypatch):
+    arrivals = _Arrivals()
+    monkeypatch.setattr(server, "_inflight", arrivals)
+    return arrivals
+
+
+def _concurrently(callers, fn):
+    """Calls fn from that many threads at once; returns each call's result or exception."""
+    def call():
+        try:
+            return fn()
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        return list(pool.map(lambda _: call(), range(callers)))
+
+
+def test_single_flight_followers_share_the_leaders_result(arrivals):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        arrivals.wait_for(5)
+        return ["game"]
+
+    results = _concurrently(5, lambda: server._single_flight("key", fetch))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert results[0] == ["game"]
+    assert not server._inflight
+
+
+def test_single_flight_followers_share_the_leaders_exception(arrivals):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        arrivals.wait_for(5)
+        raise RuntimeError("upstream down")
+
+    results = _concurrently(5, lambda: server._single_flight("key", fetch))
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) and result is results[0] for result in results)
+    # The failed call is forgotten, so the next caller asks upstream again.
+    assert not server._inflight
+    assert server._single_flight("key", lambda: "retried") == "retried"
+
+
+@pytest.fixture
+def shard_upstream(monkeypatch):
+    """Replaces the upstream schedule request with a stub; set `result` to a list or an exception."""
+    class ShardUpstream:
+        result = [{"game_id": 1, "status": "Final"}]
+        delay = 0
+        calls = 0
+
+    def fetch(start_date, end_date, team_id=None):
+        ShardUpstream.calls += 1
+        time.sleep(ShardUpstream.delay)
+        if isinstance(ShardUpstream.result, Exception):
+            raise ShardUpstream.result
+        return ShardUpstream.result
+
+    monkeypatch.setattr(server, "_fetch_schedule_shard", fetch)
+    return ShardUpstream
+
+
+def test_empty_schedule_served_from_negative_cache(shard_upstream):
+    shard_upstream.result = []
+    assert server._request_schedule_shard("2026-01-05", "2026-01-05") == []
+    assert server._request_schedule_shard("2026-01-05", "2026-01-05") == []
+    assert shard_upstream.calls == 1
+
+
+def test_last_good_schedule_served_when_fetch_fails(shard_upstream):
+    good = server._request_schedule_shard("2026-06-01", "2026-06-01")
+    shard_upstream.result = requests.ConnectionError("upstream down")
+    assert server._request_schedule_shard("2026-06-01", "2026-06-01") is good
+    with pytest.raises(requests.ConnectionError):
+        server._request_schedule_shard("2026-06-02", "2026-06-02")
+
+
+def test_breaker_counts_upstream_requests_not_callers(shard_upstream, arrivals, monkeypatch):
+    monkeypatch.setattr(server, "_SLOW_REQUEST_SECONDS", 0.005)
+    fetch = server._fetch_schedule_shard
+
+    def slow_fetch(*args):
+        arrivals.wait_for(5)
+        time.sleep(0.01)
+        return fetch(*args)
+
+    monkeypatch.setattr(server, "_fetch_schedule_shard", slow_fetch)
+    _concurrently(5, lambda: server._request_schedule_shard("2026-06-01", "2026-06-01"))
+    assert shard_upstream.calls == 1
+    assert server._schedule_health['fail_streak'] == 1
+    assert not server._schedule_degraded()
+
+
+def test_breaker_trips_after_slow_requests_and_serves_last_good(shard_upstream, monkeypatch):
+    monkeypatch.setattr(server, "_SLOW_REQUEST_SECONDS", 0.005)
+    last_good = server._request_schedule_shard("2026-06-01", "2026-06-01")
+    shard_upstream.delay = 0.01
+    for day in range(2, 2 + server._FAIL_STREAK_LIMIT + 1):
+        server._request_schedule_shard("2026-06-01", f"2026-06-{day:02d}")
+    assert server._schedule_degraded()
+
+    calls = shard_upstream.calls
+    monkeypatch.setattr(server._EXECUTOR, "submit", lambda *args: None)
+    assert server._request_schedule_shard("2026-06-01", "2026-06-01") is last_good
+    assert shard_upstream.calls == calls
+
+
+@pytest.fixture
+def silent_upstream(monkeypatch):
+    """Points statsapi at a local socket that accepts connections and never answers."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(16)
+    listener.settimeout(0.05)
+    connections = []
+    stop = threading.Event()
+
+    def accept():
+        while not stop.is_set():
+            with contextlib.suppress(OSError):
+                connections.append(listener.accept()[0])
+
+    thread = threading.Thread(target=accept, daemon=True)
+    thread.start()
+    base = "http://127.0.0.1:%d" % listener.getsockname()[1]
+    trim = server._trim_schedule_hydrate
+    monkeypatch.setattr(server, "_trim_schedule_hydrate", lambda url: trim(url).replace("https://statsapi.mlb.com", base))
+    monkeypatch.setitem(server._session.adapters, "http://", server._session.get_adapter("https://"))
+    monkeypatch.setattr(server, "_REQUEST_TIMEOUT", 0.2)
+    yield connections
+    stop.set()
+    thread.join()
+    for connection in connections:
+        connection.close()
+    listener.close()
+
+
+def test_read_timeouts_are_not_retried(silent_upstream):
+    with pytest.raises(requests.Timeout):
+        server._fetch_schedule_shard("2026-06-01", "2026-06-01")
+    time.sleep(0.1)
+    assert len(silent_upstream) == 1
+
+
+def _http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize("error, attempts", [
+    (_http_error(503), 2),
+    (_http_error(404), 1),
+    (requests.Timeout(), 1),
+])
+def test_schedule_retries_only_server_errors(monkeypatch, error, attempts):
+    calls = []
+
+    def schedule(**kwargs):
+        calls.append(kwargs)
+        raise error
+
+    monkeypatch.setattr(statsapi, "schedule", schedule)
+    with pytest.raises(type(error)):
+        server._fetch_schedule_shard("2026-06-01", "2026-06-01")
+    assert len(calls) == attempts
+
+
+def test_schedule_fields_projected(upstream):
+    upstream.games = [{"game_id": 1, "status": "Final", "venue_name": "Dodger Stadium"}]
+    games = asyncio.run(server.get_mlb_schedule("2026-06-01", "2026-06-01", fields=["game_id", "venue_name"]))
+    assert games == [{"game_id": 1, "venue_name": "Dodger Stadium"}]
+
+
+@pytest.mark.parametrize("field", ["national_broadcasts", "home_pitcher_note", "away_pitcher_note", "no_such_field"])
+def test_schedule_fields_rejects_unavailable_fields(upstream, field):
+    with pytest.raises(ValueError, match=field):
+        asyncio.run(server.get_mlb_schedule("2026-06-01", "2026-06-01", fields=["game_id", field]))
+    assert not upstream.calls